@@ -4,6 +4,7 @@
 # - variables, math, string concat, boolean logic
 # - if / else / while blocks (closed by 'end')
 # - def / return functions with local scope & args
+# - sources compiled once to flat bytecode, run by a small stack VM
 # - import modulename (loads modulename.stryke into module namespace)
 # - file IO: readfile(path), writefile(path,content)
 # - stryinput("prompt")
@@ -12,20 +13,39 @@
 # - helper REPL commands: compile, stinstall, tests run, show vars/funcs/modules
 # - Version: v1.0
 
+import array
 import ast
+import copy
+import functools
+import hashlib
+import mmap
 import operator
 import re
 import sys
 import os
 import traceback
 
+# helper tools that ship next to StrykeCore; the REPL and JIT degrade without them
+try:
+    import stryke_to_py
+except ImportError:
+    stryke_to_py = None
+try:
+    import stryinstall
+except ImportError:
+    stryinstall = None
+try:
+    import test_harness
+except ImportError:
+    test_harness = None
+
 VERSION = "v1.0"
 
 # ---------------------------
 # Environment
 # ---------------------------
 global_env = {"__modules__": {}, "__packages__": {}}
-env = {"vars": {}, "funcs": {}}
+env = {"vars": {}, "funcs": {}, "frames": []}  # frames: (CodeObject, slots) per active call
 
 # ---------------------------
 # Debugger state
@@ -34,9 +54,33 @@ _debug_mode = False
 _breakpoints = set()
 _single_step = False
 _step_over_depth = None
+_DEBUG_ACTIVE = False   # _single_step or _breakpoints; LINE ops skip the debugger when False
 _call_depth = 0
 _watch_expressions = []
 
+# ---------------------------
+# JIT state
+# ---------------------------
+_JIT_THRESHOLD = 50     # calls before a user function is compiled to Python
+_hot_count = {}
+_compiled_funcs = {}    # name -> Python function, or None if not compilable
+_numba = False          # numba module once imported; None if it is not installed
+_NUMERIC_BUILTINS = ("abs", "min", "max")
+_PURE_BUILTINS = ("int", "float", "str", "len", "abs", "max", "min", "round")
+_JIT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__strykecache__")
+
+# ---------------------------
+# Statement patterns
+# ---------------------------
+_PAT_SET = re.compile(r'^\s*stryset\s+(\w+)\s*\(\s*(.+)\s*\)\s*$')
+_PAT_PRINT = re.compile(r'^\s*stryprint\s+(.+)$')
+_PAT_DEF = re.compile(r'^\s*def\s+(\w+)\s*\((.*?)\)\s*:\s*$')
+_PAT_RETURN = re.compile(r'^\s*return\s+(.+)$')
+_PAT_IF = re.compile(r'^\s*if\s*\(\s*(.+)\s*\)\s*:\s*$')
+_PAT_WHILE = re.compile(r'^\s*while\s*\(\s*(.+)\s*\)\s*:\s*$')
+_PAT_ELSE = re.compile(r'^else\s*:\s*$')
+_PAT_PLACEHOLDER = re.compile(r'\{([A-Za-z_]\w*)\}')  # {name} inside a stryprint literal
+
 _ops = {
     ast.Add: operator.add,
     ast.Sub: operator.sub,
@@ -52,10 +96,37 @@ _ops = {
     ast.LtE: operator.le,
     ast.Gt: operator.gt,
     ast.GtE: operator.ge,
-    ast.And: lambda a, b: a and b,
-    ast.Or: lambda a, b: a or b,
 }
 
+def _readfile(p):
+    # first read sized from fstat, then read on until EOF: procfs and growing files misreport size
+    fd = os.open(p, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        chunks = []
+        size = max(os.fstat(fd).st_size, 4096)
+        while True:
+            chunk = os.read(fd, size)
+            if not chunk: break
+            chunks.append(chunk)
+        data = b"".join(chunks)
+    finally:
+        os.close(fd)
+    text = data.decode("utf-8")
+    if "\r" in text: text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def _writefile(p, c):
+    text = str(c)
+    buf = (text.replace("\n", os.linesep) if os.linesep != "\n" else text).encode("utf-8")
+    fd = os.open(p, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        view = memoryview(buf)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return len(text) or True
+
 safe_functions = {
     "int": int,
     "float": float,
@@ -65,108 +136,759 @@ safe_functions = {
     "max": max,
     "min": min,
     "round": round,
-    "readfile": lambda p: open(p, "r", encoding="utf-8").read(),
-    "writefile": lambda p, c: open(p, "w", encoding="utf-8").write(str(c)) or True,
+    "readfile": _readfile,
+    "writefile": _writefile,
     "input": lambda p="": input(p),
 }
 
+# ---------------------------
+# Bytecode
+# ---------------------------
+# Each instruction is an (op, arg) tuple. Control flow, local slot access and
+# LINE run inline in run_code; everything else goes through _handlers[op].
+(LOAD_CONST, LOAD_VAR, STORE_VAR, LOAD_GLOBAL, STORE_GLOBAL,
+ BINOP_ADD, BINOP_SUB, BINOP_MUL, BINOP_DIV, BINOP_MOD, BINOP_POW,
+ UNARY_POS, UNARY_NEG,
+ COMPARE_EQ, COMPARE_NE, COMPARE_LT, COMPARE_LE, COMPARE_GT, COMPARE_GE,
+ COMPARE_CHAIN, JMP_IF_FALSE_OR_POP, JMP_IF_TRUE_OR_POP,
+ CALL, JMP, JMP_IF_FALSE, RET, PRINT, BUILD_STRING, MAKE_FUNCTION, LINE) = range(30)
+
+_BINOP_CODES = {
+    ast.Add: BINOP_ADD, ast.Sub: BINOP_SUB, ast.Mult: BINOP_MUL,
+    ast.Div: BINOP_DIV, ast.Mod: BINOP_MOD, ast.Pow: BINOP_POW,
+}
+_UNARY_CODES = {ast.UAdd: UNARY_POS, ast.USub: UNARY_NEG}
+_COMPARE_CODES = {
+    ast.Eq: COMPARE_EQ, ast.NotEq: COMPARE_NE, ast.Lt: COMPARE_LT,
+    ast.LtE: COMPARE_LE, ast.Gt: COMPARE_GT, ast.GtE: COMPARE_GE,
+}
+
+_UNSET = object()  # marks a local slot that has not been assigned yet
+
+class CodeObject:
+    """Compiled form of a .stryke source or of one function body."""
+    __slots__ = ("name", "source_name", "lines", "params", "varnames", "source", "code", "consts", "_const_index")
+
+    def __init__(self, name, source_name, params=None):
+        self.name = name
+        self.source_name = source_name
+        self.lines = None  # source lines; LINE ops carry an index into them
+        self.params = params or []
+        # module-level code keeps its variables in env["vars"]; functions get slots
+        self.varnames = list(self.params) if params is not None else None
+        self.source = None  # (lines, start, stop) of a function body, kept for the JIT
+        self.code = []
+        self.consts = []
+        self._const_index = {}
+
+    @property
+    def body(self):
+        if self.source is None: return None
+        lines, start, stop = self.source
+        return lines[start:stop]
+
+    @property
+    def nlocals(self):
+        return len(self.varnames) if self.varnames is not None else 0
+
+    def emit(self, op, arg=None):
+        self.code.append((op, arg))
+        return len(self.code) - 1
+
+    def patch(self, at, arg):
+        self.code[at] = (self.code[at][0], arg)
+
+    def const(self, value):
+        key = (type(value), value)
+        if key not in self._const_index:
+            self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return self._const_index[key]
+
+    def finish(self):
+        self.emit(LOAD_CONST, self.const(None))
+        self.emit(RET)
+        self.consts = tuple(self.consts)
+        return self
+
 def _debug_print(*args):
     if _debug_mode:
         print("[DEBUG]", *args)
 
-def eval_ast(node):
-    if isinstance(node, ast.Expression):
-        return eval_ast(node.body)
-    if isinstance(node, ast.Constant):
-        return node.value
-    if hasattr(ast, "Num") and isinstance(node, ast.Num):
-        return node.n
-    if hasattr(ast, "Str") and isinstance(node, ast.Str):
-        return node.s
-    if isinstance(node, ast.BinOp):
-        left = eval_ast(node.left)
-        right = eval_ast(node.right)
-        return _ops[type(node.op)](left, right)
-    if isinstance(node, ast.UnaryOp):
-        operand = eval_ast(node.operand)
-        return _ops[type(node.op)](operand)
-    if isinstance(node, ast.BoolOp):
-        values = [eval_ast(v) for v in node.values]
-        return all(values) if isinstance(node.op, ast.And) else any(values)
-    if isinstance(node, ast.Compare):
-        left = eval_ast(node.left)
-        for op, comp in zip(node.ops, node.comparators):
-            right = eval_ast(comp)
-            if not _ops[type(op)](left, right):
-                return False
-            left = right
-        return True
-    if isinstance(node, ast.Name):
-        idn = node.id
-        if idn in env["vars"]: return env["vars"][idn]
-        if idn in global_env: return global_env[idn]
-        if idn in safe_functions: return safe_functions[idn]
-        raise NameError(f"Unknown identifier: {idn}")
-    if isinstance(node, ast.Call):
-        if isinstance(node.func, ast.Name):
-            fname = node.func.id
-            args = [eval_ast(a) for a in node.args]
-            if fname in env["funcs"]:
-                return call_user_func(fname, args)
-            if fname in safe_functions:
-                return safe_functions[fname](*args)
-            raise NameError(f"Unknown function: {fname}")
-        raise ValueError("Unsupported call expression")
-    raise ValueError("Unsupported expression type: " + str(type(node)))
+def _frame_locals(co, frame):
+    if not co.varnames: return {}
+    return {n: v for n, v in zip(co.varnames, frame) if v is not _UNSET}
+
+def _load_global(idn):
+    if idn in env["vars"]: return env["vars"][idn]
+    if idn in global_env: return global_env[idn]
+    if idn in safe_functions: return safe_functions[idn]
+    raise NameError(f"Unknown identifier: {idn}")
+
+def _eval_expression(node, frame):
+    return eval_ast(node.body, frame)
+
+def _eval_const(node, frame):
+    return node.value
+
+def _eval_binop(node, frame):
+    left = eval_ast(node.left, frame)
+    right = eval_ast(node.right, frame)
+    return node._fn(left, right)
+
+def _eval_unaryop(node, frame):
+    operand = eval_ast(node.operand, frame)
+    return node._fn(operand)
+
+def _eval_boolop(node, frame):
+    # short-circuit like Python: stop at the first operand that decides the result
+    if isinstance(node.op, ast.And):
+        for v in node.values:
+            r = eval_ast(v, frame)
+            if not r: return r
+        return r
+    for v in node.values:
+        r = eval_ast(v, frame)
+        if r: return r
+    return r
+
+def _eval_compare(node, frame):
+    left = eval_ast(node.left, frame)
+    for fn, comp in zip(node._fn, node.comparators):
+        right = eval_ast(comp, frame)
+        if not fn(left, right):
+            return False
+        left = right
+    return True
+
+def _eval_name(node, frame):
+    kind, ref = node._slot
+    if kind == "L":
+        v = frame[ref]
+        if v is _UNSET: return _load_global(node.id)  # local not bound yet: read the global
+        return v
+    return _load_global(ref)
+
+def _eval_call(node, frame):
+    if isinstance(node.func, ast.Name):
+        fname = node.func.id
+        args = [eval_ast(a, frame) for a in node.args]
+        if fname in env["funcs"]:
+            return call_user_func(fname, args)
+        if fname in safe_functions:
+            return safe_functions[fname](*args)
+        raise NameError(f"Unknown function: {fname}")
+    raise ValueError("Unsupported call expression")
+
+_EVAL_DISPATCH = {
+    ast.Expression: _eval_expression,
+    ast.Constant: _eval_const,
+    ast.BinOp: _eval_binop,
+    ast.UnaryOp: _eval_unaryop,
+    ast.BoolOp: _eval_boolop,
+    ast.Compare: _eval_compare,
+    ast.Name: _eval_name,
+    ast.Call: _eval_call,
+}
+
+def eval_ast(node, frame=None):
+    handler = _EVAL_DISPATCH.get(type(node))
+    if handler is None:
+        raise ValueError("Unsupported expression type: " + str(type(node)))
+    return handler(node, frame)
+
+def _unsupported_op(*args):
+    raise ValueError("Unsupported operator")
+
+def _annotate(tree):
+    """Store each operator's function on its node as node._fn, so eval_ast skips the _ops lookup."""
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.BinOp, ast.UnaryOp)):
+            node._fn = _ops.get(type(node.op), _unsupported_op)
+        elif isinstance(node, ast.Compare):
+            node._fn = [_ops.get(type(op), _unsupported_op) for op in node.ops]
+    return tree
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expr(expr_text):
+    """Parse and annotate an expression once per distinct text; None if it is not valid syntax."""
+    try:
+        return _annotate(ast.parse(expr_text, mode="eval"))
+    except Exception:
+        return None
+
+def resolve_names(tree, varnames):
+    """Pin each Name to node._slot: ("L", index) for a frame slot, ("G", name) otherwise."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            node._slot = ("L", varnames.index(node.id)) if varnames and node.id in varnames else ("G", node.id)
+    return tree
+
+@functools.lru_cache(maxsize=1024)
+def _resolved_expr(expr_text, co):
+    # the parse cache is shared by every scope, so annotate a private copy per CodeObject
+    node = _parse_expr(expr_text)
+    if node is None: return None
+    return resolve_names(copy.deepcopy(node), co.varnames if co is not None else None)
 
 def safe_eval(expr_text):
     expr_text = expr_text.strip()
     if (expr_text.startswith('"') and expr_text.endswith('"')) or (expr_text.startswith("'") and expr_text.endswith("'")):
         return expr_text[1:-1]
-    try:
-        node = ast.parse(expr_text, mode="eval")
-    except Exception:
+    co, frame = env["frames"][-1] if env["frames"] else (None, None)
+    node = _resolved_expr(expr_text, co)
+    if node is None:
         if expr_text in env["vars"]:
             return env["vars"][expr_text]
         return expr_text
-    return eval_ast(node)
-
-class ReturnSignal(Exception):
-    def __init__(self, value):
-        self.value = value
+    return eval_ast(node, frame)
 
 def call_user_func(name, arg_values):
     global _call_depth
-    params, body = env["funcs"][name]
-    if len(arg_values) != len(params):
-        raise TypeError(f"{name} expects {len(params)} args, got {len(arg_values)}")
-    saved_vars = env["vars"].copy()
+    co = env["funcs"][name]
+    if len(arg_values) != len(co.params):
+        raise TypeError(f"{name} expects {len(co.params)} args, got {len(arg_values)}")
+    fn = _jitted(name)
+    if fn is not None:
+        try: return fn(*arg_values)
+        except RecursionError: _compiled_funcs[name] = None  # too deep for Python's stack; use the VM
     _call_depth += 1
     try:
-        for p, v in zip(params, arg_values):
-            env["vars"][p] = v
-        i = 0
-        while i < len(body):
-            res = execute_line(body[i], lines=body, idx=i, source_name=f"<func {name}>")
-            if isinstance(res, ReturnSignal): return res.value
-            if isinstance(res, int): i = res
-            i += 1
+        return run_code(co, list(arg_values) + [_UNSET] * (co.nlocals - len(arg_values)))
     finally:
-        env["vars"] = saved_vars
         _call_depth -= 1
-    return None
-
-def parse_block(lines, start_idx):
-    block = []
-    i = start_idx
-    while i < len(lines):
-        if lines[i].strip() == "end":
-            return block, i
-        block.append(lines[i])
+
+_STATEMENTS = (
+    ("stryset", _PAT_SET, "set"),
+    ("stryprint", _PAT_PRINT, "print"),
+    ("def", _PAT_DEF, "def"),
+    ("return", _PAT_RETURN, "return"),
+    ("if", _PAT_IF, "if"),
+    ("while", _PAT_WHILE, "while"),
+)
+
+def classify_line(stripped):
+    """(kind, match) for a statement line, (None, None) for anything else.
+
+    The prefix check picks the one pattern worth trying.
+    """
+    for prefix, pat, kind in _STATEMENTS:
+        if stripped.startswith(prefix):
+            m = pat.match(stripped)
+            if m: return kind, m
+    return None, None
+
+def _opens_block(stripped):
+    return classify_line(stripped)[0] in ("def", "if", "while")
+
+def _is_else(stripped):
+    return stripped.startswith("else") and bool(_PAT_ELSE.match(stripped))
+
+def precompute_blocks(lines):
+    """Pair every def/if/while line with its 'end' in one pass; an if with an else maps to the else."""
+    block_end = {}
+    stack = []
+    for i, ln in enumerate(lines):
+        stripped = ln.strip()
+        if stripped == "end":
+            if stack: block_end[stack.pop()] = i
+        elif _opens_block(stripped):
+            stack.append(i)
+        elif _is_else(stripped) and stack and lines[stack[-1]].strip().startswith("if"):
+            block_end[stack[-1]] = i
+            stack[-1] = i
+    if stack:
+        raise SyntaxError(f"Missing 'end' for line {stack[-1]+1}")
+    return block_end
+
+def _assigned_names(lines, start, stop, blocks):
+    """Names bound by stryset in lines[start:stop], skipping nested defs."""
+    names = []
+    i = start
+    while i < stop:
+        kind, m = classify_line(lines[i].strip())
+        if kind == "def":
+            i = blocks[i]
+        elif kind == "set" and m.group(1) not in names:
+            names.append(m.group(1))
         i += 1
-    raise SyntaxError("Missing 'end'")
+    return names
+
+# ---------------------------
+# Compiler
+# ---------------------------
+def compile_to_bc(lines, source_name="<stdin>"):
+    """Compile .stryke source lines once into a module-level CodeObject."""
+    co = CodeObject("<module>", source_name)
+    co.lines = lines
+    # decode and strip each line once; the compile passes below only see this list
+    stripped = [ln.strip() for ln in lines]
+    _compile_range(co, stripped, 0, len(stripped), precompute_blocks(stripped))
+    return co.finish()
+
+def _compile_range(co, lines, start, stop, blocks):
+    i = start
+    while i < stop:
+        i = _compile_line(co, lines, i, blocks) + 1
+
+def _compile_line(co, lines, idx, blocks):
+    """Emit code for the (stripped) statement at lines[idx]; returns the last line index consumed."""
+    kind, m = classify_line(lines[idx])
+    if kind is None: return idx  # blank, comment, 'end' and unknown lines emit nothing
+    co.emit(LINE, idx)
+    return _STMT_COMPILERS[kind](co, lines, idx, blocks, m)
+
+def _compile_set(co, lines, idx, blocks, m):
+    name, expr = m.groups()
+    _compile_expr_text(co, expr)
+    if co.varnames is not None: co.emit(STORE_VAR, co.varnames.index(name))
+    else: co.emit(STORE_GLOBAL, name)
+    return idx
+
+def _compile_print(co, lines, idx, blocks, m):
+    expr = m.group(1).strip()
+    parts = _PAT_PLACEHOLDER.split(expr[1:-1]) if len(expr) > 1 and expr[0] in ('"', "'") and expr[-1] == expr[0] else []
+    if len(parts) > 1:
+        # "Hi {name}!" -> load each piece and join them, as stryke_to_py's f-string does
+        for i, part in enumerate(parts):
+            if i % 2: _compile_expr(co, ast.Name(id=part))
+            else: co.emit(LOAD_CONST, co.const(part))
+        co.emit(BUILD_STRING, len(parts))
+    else:
+        _compile_expr_text(co, expr)
+    co.emit(PRINT)
+    return idx
+
+def _compile_def(co, lines, idx, blocks, m):
+    fname, params = m.groups(); param_list=[p.strip() for p in params.split(",") if p.strip()]
+    end_idx=blocks[idx]
+    fco = CodeObject(fname, co.source_name, param_list)
+    fco.lines = co.lines
+    fco.source = (co.lines, idx+1, end_idx)
+    fco.varnames += [n for n in _assigned_names(lines, idx+1, end_idx, blocks) if n not in param_list]
+    _compile_range(fco, lines, idx+1, end_idx, blocks)
+    co.emit(MAKE_FUNCTION, (fname, fco.finish()))
+    return end_idx
+
+def _compile_return(co, lines, idx, blocks, m):
+    _compile_expr_text(co, m.group(1)); co.emit(RET)
+    return idx
+
+def _compile_if(co, lines, idx, blocks, m):
+    else_idx = end_idx = blocks[idx]
+    _compile_expr_text(co, m.group(1))
+    jmp_else = co.emit(JMP_IF_FALSE)
+    _compile_range(co, lines, idx+1, else_idx, blocks)
+    if else_idx in blocks:
+        end_idx = blocks[else_idx]
+        jmp_end = co.emit(JMP)
+        co.patch(jmp_else, len(co.code))
+        _compile_range(co, lines, else_idx+1, end_idx, blocks)
+        co.patch(jmp_end, len(co.code))
+    else:
+        co.patch(jmp_else, len(co.code))
+    return end_idx
+
+def _compile_while(co, lines, idx, blocks, m):
+    end_idx=blocks[idx]
+    top = len(co.code) - 1  # re-run the LINE op so the debugger sees each iteration
+    _compile_expr_text(co, m.group(1))
+    jmp_exit = co.emit(JMP_IF_FALSE)
+    _compile_range(co, lines, idx+1, end_idx, blocks)
+    co.emit(JMP, top)
+    co.patch(jmp_exit, len(co.code))
+    return end_idx
 
-def check_debug_pause(source_name, lineno, line_text):
+_STMT_COMPILERS = {
+    "set": _compile_set, "print": _compile_print, "def": _compile_def,
+    "return": _compile_return, "if": _compile_if, "while": _compile_while,
+}
+
+def _compile_expr_text(co, expr_text):
+    # mirrors safe_eval: quoted text is a literal, unparsable text is itself
+    expr_text = expr_text.strip()
+    if (expr_text.startswith('"') and expr_text.endswith('"')) or (expr_text.startswith("'") and expr_text.endswith("'")):
+        co.emit(LOAD_CONST, co.const(expr_text[1:-1])); return
+    node = _parse_expr(expr_text)
+    if node is None:
+        co.emit(LOAD_CONST, co.const(expr_text)); return
+    _compile_expr(co, node.body)
+
+def _compile_expr(co, node):
+    if isinstance(node, ast.Constant):
+        co.emit(LOAD_CONST, co.const(node.value)); return
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOP_CODES:
+        _compile_expr(co, node.left); _compile_expr(co, node.right)
+        co.emit(_BINOP_CODES[type(node.op)]); return
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_CODES:
+        _compile_expr(co, node.operand)
+        co.emit(_UNARY_CODES[type(node.op)]); return
+    if isinstance(node, ast.BoolOp):
+        jump = JMP_IF_FALSE_OR_POP if isinstance(node.op, ast.And) else JMP_IF_TRUE_OR_POP
+        exits = []
+        for v in node.values[:-1]:
+            _compile_expr(co, v); exits.append(co.emit(jump))
+        _compile_expr(co, node.values[-1])
+        for at in exits: co.patch(at, len(co.code))
+        return
+    if isinstance(node, ast.Compare):
+        if any(type(op) not in _COMPARE_CODES for op in node.ops):
+            raise ValueError("Unsupported comparison")
+        _compile_expr(co, node.left)
+        for comp in node.comparators: _compile_expr(co, comp)
+        if len(node.ops) == 1: co.emit(_COMPARE_CODES[type(node.ops[0])])
+        else: co.emit(COMPARE_CHAIN, tuple(_ops[type(op)] for op in node.ops))
+        return
+    if isinstance(node, ast.Name):
+        if co.varnames is not None and node.id in co.varnames:
+            co.emit(LOAD_VAR, co.varnames.index(node.id))
+        else:
+            co.emit(LOAD_GLOBAL, node.id)
+        return
+    if isinstance(node, ast.Call):
+        if isinstance(node.func, ast.Name):
+            for a in node.args: _compile_expr(co, a)
+            co.emit(CALL, (node.func.id, len(node.args))); return
+        raise ValueError("Unsupported call expression")
+    raise ValueError("Unsupported expression type: " + str(type(node)))
+
+# ---------------------------
+# VM
+# ---------------------------
+def _make_binop(fn):
+    def handler(stack, frame, arg):
+        right = stack.pop()
+        stack[-1] = fn(stack[-1], right)
+    return handler
+
+def _make_unary(fn):
+    def handler(stack, frame, arg):
+        stack[-1] = fn(stack[-1])
+    return handler
+
+def _op_load_global(stack, frame, name):
+    stack.append(_load_global(name))
+
+def _op_store_global(stack, frame, name):
+    env["vars"][name] = stack.pop()
+    if name in safe_functions: _reset_jit()  # compiled code bound the builtin by name
+
+def _op_compare_chain(stack, frame, fns):
+    n = len(stack) - len(fns) - 1
+    values = stack[n:]; del stack[n:]
+    stack.append(all(fn(a, b) for fn, a, b in zip(fns, values, values[1:])))
+
+def _op_print(stack, frame, arg):
+    print(stack.pop())
+
+def _op_build_string(stack, frame, n):
+    values = stack[len(stack)-n:]; del stack[len(stack)-n:]
+    stack.append("".join(map(str, values)))
+
+def _op_make_function(stack, frame, arg):
+    fname, fco = arg
+    env["funcs"][fname] = fco
+    if fname in safe_functions: _reset_jit()  # shadows a builtin other compiled code may call
+    else: _hot_count.pop(fname, None); _compiled_funcs.pop(fname, None)
+
+def _reset_jit():
+    _hot_count.clear(); _compiled_funcs.clear()
+
+def _update_debug_active():
+    global _DEBUG_ACTIVE
+    _DEBUG_ACTIVE = bool(_single_step or _breakpoints)
+
+def _debug_line(co, idx):
+    global _single_step,_step_over_depth
+    if check_debug_pause(co.source_name, idx+1):
+        try: text = co.lines[idx]
+        except OSError: text = "<source changed>"
+        action=debug_prompt(co.source_name, idx+1, text)
+        if action=="continue": _single_step=False
+        elif action=="step": _single_step=True
+        elif action=="next": _step_over_depth=_call_depth; _single_step=True
+        _update_debug_active()
+
+_handlers = [None] * (LINE + 1)
+for _node_type, _code in _BINOP_CODES.items(): _handlers[_code] = _make_binop(_ops[_node_type])
+for _node_type, _code in _COMPARE_CODES.items(): _handlers[_code] = _make_binop(_ops[_node_type])
+for _node_type, _code in _UNARY_CODES.items(): _handlers[_code] = _make_unary(_ops[_node_type])
+_handlers[LOAD_GLOBAL] = _op_load_global
+_handlers[STORE_GLOBAL] = _op_store_global
+_handlers[COMPARE_CHAIN] = _op_compare_chain
+_handlers[PRINT] = _op_print
+_handlers[BUILD_STRING] = _op_build_string
+_handlers[MAKE_FUNCTION] = _op_make_function
+
+def run_code(co, frame=None):
+    """Run a CodeObject until its outermost RET and return the value."""
+    global _call_depth
+    code, consts = co.code, co.consts
+    if frame is None: frame = [_UNSET] * co.nlocals
+    stack = []
+    calls = []  # return pcs, one per frame pushed below
+    frames = env["frames"]; base = len(frames)
+    frames.append((co, frame))
+    handlers = _handlers
+    funcs = env["funcs"]
+    pc = 0
+    try:
+        while True:
+            op, arg = code[pc]; pc += 1
+            if op == LOAD_CONST:
+                stack.append(consts[arg])
+            elif op == LOAD_VAR:
+                v = frame[arg]
+                if v is _UNSET: v = _load_global(co.varnames[arg])  # local not bound yet: read the global
+                stack.append(v)
+            elif op == STORE_VAR:
+                frame[arg] = stack.pop()
+            elif op == JMP:
+                pc = arg
+            elif op == JMP_IF_FALSE:
+                if not stack.pop(): pc = arg
+            elif op == LINE:
+                if _DEBUG_ACTIVE: _debug_line(co, arg)
+            elif op == JMP_IF_FALSE_OR_POP:
+                if stack[-1]: stack.pop()
+                else: pc = arg
+            elif op == JMP_IF_TRUE_OR_POP:
+                if stack[-1]: pc = arg
+                else: stack.pop()
+            elif op == CALL:
+                fname, argc = arg
+                n = len(stack) - argc
+                args = stack[n:]; del stack[n:]
+                if fname in funcs:
+                    callee = funcs[fname]
+                    if argc != len(callee.params):
+                        raise TypeError(f"{fname} expects {len(callee.params)} args, got {argc}")
+                    fn = _jitted(fname)
+                    if fn is not None:
+                        try:
+                            stack.append(fn(*args)); continue
+                        except RecursionError:
+                            _compiled_funcs[fname] = None  # too deep for Python's stack; use the VM
+                    calls.append(pc)
+                    co, code, consts, pc = callee, callee.code, callee.consts, 0
+                    frame = args + [_UNSET] * (callee.nlocals - argc)
+                    frames.append((co, frame))
+                    _call_depth += 1
+                elif fname in safe_functions:
+                    stack.append(safe_functions[fname](*args))
+                else:
+                    raise NameError(f"Unknown function: {fname}")
+            elif op == RET:
+                if not calls: return stack.pop()
+                pc = calls.pop()
+                frames.pop(); co, frame = frames[-1]
+                code, consts = co.code, co.consts
+                _call_depth -= 1
+            else:
+                handlers[op](stack, frame, arg)
+    finally:
+        del frames[base:]
+        _call_depth -= len(calls)
+
+# ---------------------------
+# JIT
+# ---------------------------
+def _jitted(name):
+    """Compiled version of a hot user function, or None to run it on the VM."""
+    if _DEBUG_ACTIVE: return None  # compiled code has no LINE ops
+    fn = _compiled_funcs.get(name)
+    if fn is not None or name in _compiled_funcs: return fn
+    count = _hot_count.get(name, 0) + 1
+    _hot_count[name] = count
+    if count < _JIT_THRESHOLD: return None
+    fn = _compiled_funcs[name] = compile_func_to_python(name)
+    return fn
+
+def _jit_expr_ok(node, local_names):
+    if isinstance(node, ast.Constant): return True
+    if isinstance(node, ast.BinOp):
+        return type(node.op) in _BINOP_CODES and _jit_expr_ok(node.left, local_names) and _jit_expr_ok(node.right, local_names)
+    if isinstance(node, ast.UnaryOp):
+        return type(node.op) in _UNARY_CODES and _jit_expr_ok(node.operand, local_names)
+    if isinstance(node, ast.BoolOp):
+        return all(_jit_expr_ok(v, local_names) for v in node.values)
+    if isinstance(node, ast.Compare):
+        return (all(type(op) in _COMPARE_CODES for op in node.ops)
+                and all(_jit_expr_ok(n, local_names) for n in [node.left] + node.comparators))
+    if isinstance(node, ast.Name):
+        # module globals live in env["vars"] and are not visible to compiled code
+        return node.id in local_names or (node.id in safe_functions and node.id not in env["vars"])
+    if isinstance(node, ast.Call):
+        return (isinstance(node.func, ast.Name) and not node.keywords
+                and node.func.id not in local_names
+                and (node.func.id in env["funcs"] or node.func.id in safe_functions)
+                and all(_jit_expr_ok(a, local_names) for a in node.args))
+    return False
+
+def _jit_text_ok(expr_text, local_names):
+    expr_text = expr_text.strip()
+    node = _parse_expr(expr_text)
+    if node is None: return False
+    if (expr_text.startswith('"') and expr_text.endswith('"')) or (expr_text.startswith("'") and expr_text.endswith("'")):
+        # the VM strips the quotes verbatim; Python must agree on the value
+        return isinstance(node.body, ast.Constant) and node.body.value == expr_text[1:-1]
+    return _jit_expr_ok(node.body, local_names)
+
+def _body_statements(body):
+    """Yield (kind, expr_text) for each statement of a function body; kind None if unknown."""
+    for ln in body:
+        stripped = ln.strip()
+        if not stripped or stripped.startswith("#") or stripped == "end" or _is_else(stripped): continue
+        kind, m = classify_line(stripped)
+        if kind == "set": yield kind, m.group(2)
+        elif kind == "print": yield kind, m.group(1).strip()
+        elif kind in ("return", "if", "while"): yield kind, m.group(1)
+        else: yield None, stripped  # nested def or a line the VM ignores
+
+def _reads_unbound_local(co):
+    """True if the body may read a local before it is surely assigned.
+
+    The VM reads the global in that case; compiled Python would raise UnboundLocalError.
+    """
+    bound = set(co.params)
+    depth = 0
+    for ln in co.body:
+        stripped = ln.strip()
+        if stripped == "end": depth -= 1; continue
+        kind, m = classify_line(stripped)
+        if kind is None: continue
+        if kind == "def": return True
+        expr = (m.group(2) if kind == "set" else m.group(1)).strip()
+        node = _parse_expr(expr)
+        names = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)} if node is not None else set()
+        if kind == "print" and len(expr) > 1 and expr[0] in ('"', "'"): names.update(_PAT_PLACEHOLDER.findall(expr))
+        if any(n in co.varnames and n not in bound for n in names): return True
+        if kind == "set" and depth == 0: bound.add(m.group(1))
+        elif kind in ("if", "while"): depth += 1
+    return False
+
+def _jit_eligible(co):
+    """True if translating co.body to Python keeps the VM's semantics."""
+    local_names = set(co.varnames)
+    if "print" in local_names or _reads_unbound_local(co): return False
+    for kind, expr in _body_statements(co.body):
+        if kind == "print" and ((expr.startswith('"') and expr.endswith('"')) or (expr.startswith("'") and expr.endswith("'"))):
+            # stryke_to_py emits an f-string; it prints the same for plain text and {local}
+            inner = expr[1:-1]
+            if any(c in _PAT_PLACEHOLDER.sub("", inner) for c in "{}\\\"'"): return False
+            if any(n not in local_names for n in _PAT_PLACEHOLDER.findall(inner)): return False
+            continue
+        if kind is None or not _jit_text_ok(expr, local_names): return False
+    # compiled code recurses on Python's stack, so only a pure self-recursive body is
+    # compiled; if it runs out of stack the call is redone on the VM
+    called = _called_names(co)
+    if any(f in env["funcs"] and f != co.name for f in called): return False
+    if co.name in called:
+        if any(kind == "print" for kind, _ in _body_statements(co.body)): return False
+        if any(f != co.name and f not in _PURE_BUILTINS for f in called): return False
+    return True
+
+def _called_names(co):
+    names = set()
+    for kind, expr in _body_statements(co.body):
+        node = _parse_expr(expr.strip())
+        if node is None: continue
+        names.update(n.func.id for n in ast.walk(node) if isinstance(n, ast.Call) and isinstance(n.func, ast.Name))
+    return names
+
+def _float_expr(node, co):
+    """True if node yields a float whenever every local of co holds one.
+
+    Int constants are out (numba's int64 wraps). So is ** (Python may go complex).
+    """
+    if isinstance(node, ast.Constant): return type(node.value) is float
+    if isinstance(node, ast.BinOp):
+        return type(node.op) is not ast.Pow and _float_expr(node.left, co) and _float_expr(node.right, co)
+    if isinstance(node, ast.UnaryOp): return _float_expr(node.operand, co)
+    if isinstance(node, ast.Name): return node.id in co.varnames
+    if isinstance(node, ast.Call):
+        return node.func.id in _NUMERIC_BUILTINS and node.args and all(_float_expr(a, co) for a in node.args)
+    return False
+
+def _float_cond(node, co):
+    if isinstance(node, ast.Compare): return all(_float_expr(n, co) for n in [node.left] + node.comparators)
+    if isinstance(node, ast.BoolOp): return all(_float_cond(v, co) for v in node.values)
+    return _float_expr(node, co)
+
+def _numeric_only(co):
+    """True if, given float arguments, every local and result of an eligible body is a float.
+
+    Only then does numba's typed code return exactly what Python would.
+    """
+    if not co.params: return False
+    for kind, expr in _body_statements(co.body):
+        if kind == "print": return False
+        check = _float_cond if kind in ("if", "while") else _float_expr
+        if not check(_parse_expr(expr.strip()).body, co): return False
+    return True
+
+def _get_numba():
+    global _numba
+    if _numba is False:
+        try: import numba as _numba
+        except ImportError: _numba = None
+    return _numba
+
+def _jit_source_file(name, src):
+    # numba's on-disk cache needs real source; name the file by content so it stays valid
+    path = os.path.join(_JIT_CACHE_DIR, f"{name}_{hashlib.sha1(src.encode('utf-8')).hexdigest()[:12]}.py")
+    if not os.path.isfile(path):
+        os.makedirs(_JIT_CACHE_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f: f.write(src)
+    return path
+
+def _numba_wrap(py_fn):
+    """njit py_fn for float arguments; everything else, and any failure, runs plain Python."""
+    numba = _get_numba()
+    from numba.core.errors import TypingError
+    try:
+        jit_fn = numba.njit(cache=True)(py_fn)
+    except Exception:
+        return py_fn
+    native = True
+    def dispatch(*args):
+        nonlocal native
+        # the body is only proven float for float arguments; ints stay on py_fn
+        if native and all(type(a) is float for a in args):
+            try:
+                return jit_fn(*args)
+            except TypingError:
+                native = False
+            except Exception:
+                pass  # numeric bodies have no side effects; py_fn raises the real error
+        return py_fn(*args)
+    return dispatch
+
+def compile_func_to_python(name):
+    """Translate a user function to Python with stryke_to_py and compile it once."""
+    co = env["funcs"][name]
+    if stryke_to_py is None or co.source is None: return None
+    try:
+        if not _jit_eligible(co): return None
+        py_lines = stryke_to_py.translate_lines(co.body) or ["pass"]
+        numeric = _numeric_only(co) and _get_numba() is not None
+    except OSError:
+        return None  # the source file was edited after it was compiled
+    src = f"def {name}({', '.join(co.params)}):\n" + "".join("    " + l + "\n" for l in py_lines)
+    ns = {"__builtins__": {"print": print}, "__name__": "stryke_jit"}
+    ns.update(safe_functions)
+    filename = f"<stryke:{name}>"
+    if numeric:
+        try: filename = _jit_source_file(name, src)
+        except OSError: numeric = False  # e.g. a read-only install: plain Python still works
+    try:
+        exec(compile(src, filename, "exec"), ns)
+    except SyntaxError:
+        return None
+    _debug_print("jit compiled", name, "(numba)" if numeric else "")
+    return _numba_wrap(ns[name]) if numeric else ns[name]
+
+def check_debug_pause(source_name, lineno):
     return _single_step or (source_name, lineno) in _breakpoints or lineno in _breakpoints
 
 def debug_prompt(source_name, lineno, line_text):
@@ -185,74 +907,90 @@ def debug_prompt(source_name, lineno, line_text):
         if cmd.startswith("b "):
             arg = cmd[2:].strip()
             if ":" in arg: fname, ln = arg.split(":",1); _breakpoints.add((fname,int(ln)))
-            else: _breakpoints.add(int(arg)); print("[debug] breakpoint set", arg); continue
+            else: _breakpoints.add(int(arg))
+            _update_debug_active(); print("[debug] breakpoint set", arg); continue
         if cmd.startswith("del "):
             arg = cmd[4:].strip()
             try: _breakpoints.discard(int(arg))
             except: pass
-            print("[debug] breakpoint removed", arg); continue
-        if cmd in ("bt","stack"): print("Call depth:",_call_depth,"Vars snapshot:",env["vars"]); continue
+            _update_debug_active(); print("[debug] breakpoint removed", arg); continue
+        if cmd in ("bt","stack"):
+            print("Call depth:",_call_depth)
+            for co, frame in reversed(env["frames"]): print("  in", co.name, _frame_locals(co, frame))
+            continue
         if cmd.startswith("watch "): expr=cmd[6:].strip(); _watch_expressions.append(expr); print("[debug] watch added:", expr); continue
         if cmd.startswith("unwatch "): expr=cmd[8:].strip(); _watch_expressions.remove(expr) if expr in _watch_expressions else None; continue
-        if cmd in ("vars",): print(env["vars"]); continue
+        if cmd in ("vars",):
+            if env["frames"]: print("locals:", _frame_locals(*env["frames"][-1]))
+            print(env["vars"]); continue
         if cmd in ("help","?"):
             print("debug commands:\n  c/continue\n  s/step\n  n/next\n  b N or b file:N\n  del N\n  watch EXPR\n  unwatch EXPR\n  stack/bt\n  vars\n  help/?\n"); continue
         print("[debug] unknown debug command")
 
-def execute_line(line, lines=None, idx=None, source_name="<stdin>"):
-    global _single_step,_step_over_depth,_call_depth
-    raw=line.rstrip("\n"); stripped=raw.strip()
-    if not stripped or stripped.startswith("#"): return None
-    lineno=(idx+1) if idx is not None else 0
-    if check_debug_pause(source_name, lineno, raw):
-        action=debug_prompt(source_name, lineno, raw)
-        if action=="continue": pass
-        elif action=="step": _single_step=True
-        elif action=="next": _step_over_depth=_call_depth; _single_step=True
+def execute_line(line, source_name="<stdin>"):
+    _update_debug_active()
+    return run_code(compile_to_bc([line], source_name))
+
+class _MappedLines:
+    """Line sequence over a memory-mapped source; a line is decoded only when indexed.
+
+    close() drops the map after compiling so the file stays writable. Later reads
+    (JIT, debugger) map it again briefly and raise OSError if it changed meanwhile.
+    """
+    __slots__ = ("_path", "_stamp", "_mm", "_starts")
+
+    def __init__(self, path):
+        self._path = path
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self._stamp = (st.st_size, st.st_mtime_ns)
+            # mmap refuses empty files
+            self._mm = mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else None
+        starts = array.array("Q")
+        i, size = 0, st.st_size
+        while i < size:
+            starts.append(i)
+            j = mm.find(b"\n", i)
+            if j < 0: break
+            i = j + 1
+        starts.append(size)  # end of the last line
+        self._starts = starts
+
+    def __len__(self):
+        return len(self._starts) - 1
 
-    m=re.match(r'^\s*stryset\s+(\w+)\s*\(\s*(.+)\s*\)\s*$', stripped)
-    if m:
-        name, expr = m.groups(); env["vars"][name] = safe_eval(expr); return None
-
-    m=re.match(r'^\s*stryprint\s+(.+)$', stripped)
-    if m:
-        expr=m.group(1); val=safe_eval(expr); print(val); return None
-
-    m=re.match(r'^\s*def\s+(\w+)\s*\((.*?)\)\s*:\s*$', stripped)
-    if m:
-        fname, params = m.groups(); param_list=[p.strip() for p in params.split(",") if p.strip()]
-        block, end_idx=parse_block(lines, idx+1)
-        env["funcs"][fname]=(param_list, block); return end_idx
-
-    m=re.match(r'^\s*return\s+(.+)$', stripped)
-    if m:
-        val=safe_eval(m.group(1)); return ReturnSignal(val)
-
-    m=re.match(r'^\s*if\s*\(\s*(.+)\s*\)\s*:\s*$', stripped)
-    if m:
-        cond=safe_eval(m.group(1))
-        block, end_idx=parse_block(lines, idx+1)
-        if cond:
-            i=0
-            while i<len(block): res=execute_line(block[i], lines=block, idx=i); 
-            if isinstance(res,int): i=res; i+=1; continue
-            elif isinstance(res,ReturnSignal): return res
-            i+=1
-        return end_idx
-
-    if stripped=="end": return None
-    return None
+    def close(self):
+        if self._mm is not None: self._mm.close(); self._mm = None
+
+    def _remap(self):
+        with open(self._path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if (st.st_size, st.st_mtime_ns) != self._stamp:
+                raise OSError(f"{self._path} changed since it was compiled")
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __getitem__(self, k):
+        if self._mm is not None or not len(self): return self._read(self._mm, k)
+        with self._remap() as mm:
+            return self._read(mm, k)
+
+    def _read(self, mm, k):
+        if isinstance(k, slice): return [self._read(mm, i) for i in range(*k.indices(len(self)))]
+        if k < 0: k += len(self)
+        raw = mm[self._starts[k]:self._starts[k+1]]
+        if raw.endswith(b"\n"): raw = raw[:-1]
+        if raw.endswith(b"\r"): raw = raw[:-1]
+        return raw.decode("utf-8")
 
 def run_file(path):
     if not os.path.isfile(path): print("File not found:", path); return
-    with open(path,"r",encoding="utf-8") as f:
-        lines=f.readlines()
-    i=0
-    while i<len(lines):
-        res=execute_line(lines[i], lines, i, source_name=path)
-        if isinstance(res,int): i=res
-        elif isinstance(res,ReturnSignal): return res.value
-        i+=1
+    lines = _MappedLines(path)
+    try:
+        co = compile_to_bc(lines, path)
+    finally:
+        lines.close()
+    _update_debug_active()  # pick up breakpoints set directly on _breakpoints
+    return run_code(co)
 
 def repl():
     print(f"Stryke v{VERSION} REPL — type 'help' for commands")
@@ -270,11 +1008,16 @@ def repl():
         if cmd=="funcs": print(list(env["funcs"].keys())); continue
         if cmd=="modules": print(global_env["__modules__"]); continue
         if cmd.startswith("compile "):
-            path=cmd[8:].strip(); import stryke_to_py; stryke_to_py.compile_file(path); continue
+            path=cmd[8:].strip()
+            if stryke_to_py is None: print("compile: stryke_to_py.py not found"); continue
+            stryke_to_py.compile_file(path); continue
         if cmd.startswith("stinstall "):
-            path=cmd[10:].strip(); import stryinstall; stryinstall.install_package(path); continue
+            path=cmd[10:].strip()
+            if stryinstall is None: print("stinstall: stryinstall.py not found"); continue
+            stryinstall.install_package(path); continue
         if cmd=="tests run":
-            import test_harness; test_harness.run_tests(); continue
+            if not hasattr(test_harness, "run_tests"): print("tests: test_harness.run_tests not available"); continue
+            test_harness.run_tests(); continue
         try:
             execute_line(cmd)
         except Exception:
@@ -1,9 +1,13 @@
 # stryinstall.py - local package installer for Stryke
-import os, shutil, json, sys
+import os, shutil, json, sys, atexit, hashlib
 
 PKG_DIR = os.path.join(os.path.dirname(__file__), "lib")
 META = os.path.join(PKG_DIR, "packages.json")
 
+_meta_cache = None   # packages.json contents, read once per process
+_meta_dirty = False
+_batch_depth = 0     # >0 while install_packages defers writes
+
 def _ensure():
     if not os.path.isdir(PKG_DIR):
         os.makedirs(PKG_DIR)
@@ -11,6 +15,99 @@ def _ensure():
         with open(META, "w", encoding="utf-8") as f:
             json.dump({}, f)
 
+def _load_meta():
+    global _meta_cache
+    if _meta_cache is None:
+        _ensure()
+        with open(META, "r", encoding="utf-8") as f:
+            _meta_cache = json.load(f)
+    return _meta_cache
+
+def _flush_meta():
+    """Write packages.json if it changed, via a temp file so it is never half-written."""
+    global _meta_dirty
+    if not _meta_dirty: return
+    tmp = META + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_meta_cache, f)
+    os.replace(tmp, META)
+    _meta_dirty = False
+
+def _meta_changed():
+    global _meta_dirty
+    _meta_dirty = True
+    if not _batch_depth: _flush_meta()
+
+atexit.register(_flush_meta)
+
+def _copy_file(src, dst):
+    """Copy file contents with os.sendfile (in-kernel, no userspace buffer) where it works."""
+    if not hasattr(os, "sendfile"):
+        shutil.copyfile(src, dst); return
+    fin = os.open(src, os.O_RDONLY)
+    try:
+        fout = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            size = os.fstat(fin).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fout, fin, offset, size - offset)
+                if sent == 0: break
+                offset += sent
+        except OSError:
+            # some platforms only sendfile to sockets
+            os.close(fout); fout = None
+            shutil.copyfile(src, dst)
+        finally:
+            if fout is not None: os.close(fout)
+    finally:
+        os.close(fin)
+
+def _scan_files(path):
+    """{relpath: [size, mtime_ns]} for every file under a package directory."""
+    files = {}
+    dirs = [path]
+    while dirs:
+        with os.scandir(dirs.pop()) as it:
+            for entry in it:
+                if entry.is_dir():
+                    dirs.append(entry.path)
+                else:
+                    st = entry.stat()
+                    files[os.path.relpath(entry.path, path)] = [st.st_size, st.st_mtime_ns]
+    return files
+
+def _dir_signature(files):
+    h = hashlib.blake2b(digest_size=16)
+    for rel in sorted(files):
+        size, mtime_ns = files[rel]
+        h.update(f"{rel}\0{size}\0{mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def _sync_files(src, dest, files, old_files):
+    """Copy files that changed since the last install or are missing from dest; drop removed ones.
+
+    Returns the number of files copied or removed.
+    """
+    changed = 0
+    for rel, stat in files.items():
+        target = os.path.join(dest, rel)
+        try: intact = old_files.get(rel) == stat and os.stat(target).st_size == stat[0]
+        except OSError: intact = False
+        if not intact:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _copy_file(os.path.join(src, rel), target)
+            changed += 1
+    for rel in old_files:
+        target = os.path.join(dest, rel)
+        if rel in files or not os.path.isfile(target): continue
+        os.remove(target)
+        changed += 1
+        d = os.path.dirname(target)
+        while os.path.normpath(d) != os.path.normpath(dest) and not os.listdir(d):
+            os.rmdir(d); d = os.path.dirname(d)
+    return changed
+
 def install_package(path):
     """Install a local package directory or single .stryke file into lib/"""
     _ensure()
@@ -19,38 +116,59 @@ def install_package(path):
     name = os.path.basename(os.path.abspath(path))
     dest = os.path.join(PKG_DIR, name)
     if os.path.isdir(path):
-        if os.path.exists(dest): shutil.rmtree(dest)
-        shutil.copytree(path, dest)
+        files = _scan_files(path)
     else:
         if not path.endswith(".stryke"):
             print("[stinstall] not a .stryke file"); return
+        st = os.stat(path)
+        files = {os.path.basename(path): [st.st_size, st.st_mtime_ns]}
+    signature = _dir_signature(files)
+    entry = _load_meta().get(name)
+    old_files = entry.get("files") if entry and os.path.isdir(dest) else None
+    if old_files is not None:
+        # compare against what is really in dest, not just the recorded signature
+        src_root = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+        if not _sync_files(src_root, dest, files, old_files) and entry.get("signature") == signature:
+            print("[stinstall] up-to-date", name); return
+    elif os.path.isdir(path):
+        # nothing recorded for what is in dest: start from a clean copy
+        if os.path.exists(dest): shutil.rmtree(dest)
+        shutil.copytree(path, dest, copy_function=shutil.copyfile)
+    else:
         if not os.path.exists(dest):
             os.makedirs(dest)
-        shutil.copy2(path, os.path.join(dest, os.path.basename(path)))
-    with open(META, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        data[name] = {"installed": True, "path": dest}
-        f.seek(0); f.truncate(); json.dump(data, f, indent=2)
+        _copy_file(path, os.path.join(dest, os.path.basename(path)))
+    _load_meta()[name] = {"installed": True, "path": dest, "signature": signature, "files": files}
+    _meta_changed()
     print("[stinstall] installed", name)
 
+def install_packages(paths):
+    """Install several packages, writing packages.json once at the end."""
+    global _batch_depth
+    _batch_depth += 1
+    try:
+        for path in paths:
+            install_package(path)
+    finally:
+        _batch_depth -= 1
+        if not _batch_depth: _flush_meta()
+
 def uninstall_package(name):
-    _ensure()
-    with open(META, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        if name in data:
-            path = data[name]["path"]
-            if os.path.exists(path):
-                shutil.rmtree(path)
-            del data[name]
-            f.seek(0); f.truncate(); json.dump(data, f, indent=2)
-            print("[stinstall] removed", name)
-        else:
-            print("[stinstall] package not found:", name)
+    data = _load_meta()
+    if name in data:
+        path = data[name]["path"]
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        del data[name]
+        _meta_changed()
+        print("[stinstall] removed", name)
+    else:
+        print("[stinstall] package not found:", name)
 
 if __name__=="__main__":
     if len(sys.argv)>=3 and sys.argv[1]=="install":
-        install_package(sys.argv[2])
+        install_packages(sys.argv[2:])
     elif len(sys.argv)>=3 and sys.argv[1]=="uninstall":
         uninstall_package(sys.argv[2])
     else:
-        print("Usage: python stryinstall.py install <path> | uninstall <name>")
+        print("Usage: python stryinstall.py install <path>... | uninstall <name>")
@@ -1,56 +1,35 @@
-# stryinstall.py - local package installer for Stryke
-import os, shutil, json, sys
+# test_harness.py - runs scripts/*.stryke and compares their output with scripts/*.expected
+import os, subprocess, sys
 
-PKG_DIR = os.path.join(os.path.dirname(__file__), "lib")
-META = os.path.join(PKG_DIR, "packages.json")
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.join(ROOT, "scripts")
+CORE = os.path.join(ROOT, "StrykeCore.py")
 
-def _ensure():
-    if not os.path.isdir(PKG_DIR):
-        os.makedirs(PKG_DIR)
-    if not os.path.isfile(META):
-        with open(META, "w", encoding="utf-8") as f:
-            json.dump({}, f)
+def run_script(path):
+    """Run one .stryke file in a fresh interpreter; returns (stdout, stderr)."""
+    proc = subprocess.run([sys.executable, CORE, "run", path], capture_output=True, text=True, encoding="utf-8")
+    return proc.stdout, proc.stderr
 
-def install_package(path):
-    """Install a local package directory or single .stryke file into lib/"""
-    _ensure()
-    if not os.path.exists(path):
-        print("[stinstall] path not found:", path); return
-    name = os.path.basename(os.path.abspath(path))
-    dest = os.path.join(PKG_DIR, name)
-    if os.path.isdir(path):
-        if os.path.exists(dest): shutil.rmtree(dest)
-        shutil.copytree(path, dest)
-    else:
-        if not path.endswith(".stryke"):
-            print("[stinstall] not a .stryke file"); return
-        if not os.path.exists(dest):
-            os.makedirs(dest)
-        shutil.copy2(path, os.path.join(dest, os.path.basename(path)))
-    with open(META, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        data[name] = {"installed": True, "path": dest}
-        f.seek(0); f.truncate(); json.dump(data, f, indent=2)
-    print("[stinstall] installed", name)
+def run_tests():
+    """Run every script that has a matching .expected file; True if all outputs match."""
+    names = sorted(f[:-len(".stryke")] for f in os.listdir(SCRIPTS)
+                   if f.endswith(".stryke") and os.path.isfile(os.path.join(SCRIPTS, f[:-len(".stryke")] + ".expected")))
+    failed = []
+    for name in names:
+        with open(os.path.join(SCRIPTS, name + ".expected"), "r", encoding="utf-8") as f:
+            expected = f.read()
+        out, err = run_script(os.path.join(SCRIPTS, name + ".stryke"))
+        if out == expected:
+            print("[tests] ok  ", name)
+            continue
+        failed.append(name)
+        print("[tests] FAIL", name)
+        want, got = expected.splitlines(), out.splitlines()
+        i = next(i for i in range(max(len(want), len(got))) if want[i:i+1] != got[i:i+1])
+        print(f"    line {i+1}: expected {want[i:i+1] or '<end>'}, got {got[i:i+1] or '<end>'}")
+        if err: print("    " + err.strip().splitlines()[-1])
+    print(f"[tests] {len(names) - len(failed)}/{len(names)} passed")
+    return not failed
 
-def uninstall_package(name):
-    _ensure()
-    with open(META, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        if name in data:
-            path = data[name]["path"]
-            if os.path.exists(path):
-                shutil.rmtree(path)
-            del data[name]
-            f.seek(0); f.truncate(); json.dump(data, f, indent=2)
-            print("[stinstall] removed", name)
-        else:
-            print("[stinstall] package not found:", name)
-
-if __name__=="__main__":
-    if len(sys.argv)>=3 and sys.argv[1]=="install":
-        install_package(sys.argv[2])
-    elif len(sys.argv)>=3 and sys.argv[1]=="uninstall":
-        uninstall_package(sys.argv[2])
-    else:
-        print("Usage: python stryinstall.py install <path> | uninstall <name>")
+if __name__ == "__main__":
+    sys.exit(0 if run_tests() else 1)